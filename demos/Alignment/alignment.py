@@ -1,7 +1,32 @@
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 import numpy as np
-from math import sqrt
+from math import atan2, hypot
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is only needed to make the kernel below faster; without it we just run the NumPy version
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+# Only the contract, afn, reassoc and arcp fast maths flags, so nnan, ninf and nsz are all off
+# Points outside the unit circle give a negative discriminant, so the kernel can make NaNs
+@njit(fastmath={"contract", "afn", "reassoc", "arcp"}, cache=True)
+def _r_kernel(d, d2m1, theta, alpha, out):
+    """
+    Write the distances from a point a distance d from the origin to the edge of the unit circle into out,
+    looking along lines at angles theta from the horizontal
+
+    alpha is the angle the line joining the point to the origin makes with the horizontal, plus pi;
+    d2m1 is d^2 - 1
+
+    """
+    # This just comes out of some geometry if you draw the triangles
+    # r is the positive solution to the quadratic r^2 - 2kr + (d^2 - 1) = 0 with k = d cos(theta - alpha)
+    k = d * np.cos(theta - alpha)
+    out[:] = k + np.sqrt(k * k - d2m1)
 
 
 class Point:
@@ -19,25 +44,14 @@ class Point:
     # Distance to the origin
     _d = 0.0
 
-    def __init__(self, x, y):
-        self._x = x
-        self._y = y
-        self._phi = np.arctan2(y, x)
-        self._d = sqrt(x ** 2 + y ** 2)
+    # d^2 - 1, the constant term in the quadratic for r
+    _d2m1 = -1.0
 
-    def _r(self, theta):
-        """
-        Returns the distance from this point to the edge of the unit circle, looking along a line at an angle theta from the horizontal.
-
-        theta in rad
+    # Preallocated output for misalignment
+    _r_buf = None
 
-        """
-        # This just comes out of some geometry if you draw the triangles
-        chi = self._phi + np.pi - theta
-        b = -2 * self._d * np.cos(chi)
-        c = (self._d * self._d) - 1
-
-        return (-b + sqrt(b * b - 4 * c)) / 2
+    def __init__(self, x, y):
+        self.move(x, y)
 
     def misalignment(self, n):
         """
@@ -45,11 +59,17 @@ class Point:
 
         Returns an array of n angles equally spaced between 0 and 2pi
 
+        The distances are written into a buffer owned by this point, so they are only valid until the next call;
+        copy them if you need to keep them
+
         """
-        angles = np.linspace(0, 2 * np.pi)
+        angles = np.linspace(0, 2 * np.pi, n)
+
+        if self._r_buf is None or len(self._r_buf) != n:
+            self._r_buf = np.empty(n)
 
-        # Could make this faster, don't need to
-        return np.array([self._r(angle) for angle in angles]), angles
+        _r_kernel(self._d, self._d2m1, angles, self._phi + np.pi, self._r_buf)
+        return self._r_buf, angles
 
     def coords(self):
         return self._x, self._y
@@ -59,7 +79,11 @@ class Point:
         Move this point to (x, y)
 
         """
-        self.__init__(x, y)
+        self._x = x
+        self._y = y
+        self._phi = atan2(y, x)
+        self._d = hypot(x, y)
+        self._d2m1 = self._d * self._d - 1.0
 
 
 def main():
@@ -70,8 +94,7 @@ def main():
     ax = plt.subplot2grid((1, 3), (0, 0))
     ax2 = plt.subplot2grid((1, 3), (0, 1), colspan=2)
 
-    circle = np.array([(np.cos(x), np.sin(x)) for x in angles])
-    ax.plot(circle[:, 0], circle[:, 1])
+    ax.plot(np.cos(angles), np.sin(angles))
     point, = ax.plot(*My_Point.coords(), "r.")
     ax.axis("off")
 
@@ -1,5 +1,4 @@
-import scipy.optimize
-from numpy import cos
+import numpy as np
 
 
 def ring_fit(angle, distance):
@@ -9,8 +8,12 @@ def ring_fit(angle, distance):
     returns (A, B)
 
     """
+    angle = np.asarray(angle)
+    distance = np.asarray(distance)
 
-    def f(a, A, B):
-        return 1 + A * cos(a - B)
+    # 1 + Acos(a - B) = 1 + Acos(B)cos(a) + Asin(B)sin(a), which is linear in Acos(B) and Asin(B)
+    # So we can solve for them exactly with linear least squares instead of iterating
+    design = np.column_stack((np.cos(angle), np.sin(angle)))
+    (c, s), *_ = np.linalg.lstsq(design, distance - 1, rcond=None)
 
-    return scipy.optimize.curve_fit(f, angle, distance)[0]
+    return np.array((np.hypot(c, s), np.arctan2(s, c)))
@@ -1,5 +1,50 @@
 import numpy as np
-from math import sqrt
+from functools import lru_cache
+from math import atan2, hypot
+
+try:
+    import numexpr
+except ImportError:
+    # Numexpr is only used to speed up evaluating lots of points; NumPy is fine otherwise
+    numexpr = None
+
+# Below this many points numexpr's threading overhead costs more than fusing the expression saves
+_NUMEXPR_MIN_POINTS = 10000
+
+# Number of angle grids to keep cached before dropping the least recently used one
+_ANGLE_CACHE_SIZE = 8
+
+
+def _solve_r(k, d2m1):
+    """
+    Returns the positive solution r to the quadratic r^2 - 2kr + d2m1 = 0
+
+    This is the distance from the origin to the edge of a ring with centre a distance d from the origin,
+    where k = d cos(phi - alpha) and d2m1 = d^2 - 1
+
+    """
+    if numexpr is not None and np.size(k) >= _NUMEXPR_MIN_POINTS:
+        # Evaluate in one pass over k rather than allocating a temporary array for each operation
+        return numexpr.evaluate("k + sqrt(k * k - d2m1)", local_dict={"k": k, "d2m1": d2m1})
+
+    return k + np.sqrt(k * k - d2m1)
+
+
+@lru_cache(maxsize=_ANGLE_CACHE_SIZE)
+def _angle_grid(n):
+    """
+    Returns (angles, cos(angles), sin(angles)) for n angles equally spaced between 0 and 2pi
+
+    Cached, so moving a ring around doesn't need to re-evaluate any trig functions.
+    The arrays are shared between all callers, so they are read-only
+
+    """
+    angles = np.linspace(0, 2 * np.pi, n)
+    grid = angles, np.cos(angles), np.sin(angles)
+    for array in grid:
+        array.setflags(write=False)
+
+    return grid
 
 
 class Ring:
@@ -19,26 +64,30 @@ class Ring:
     # Distance of centre from the origin
     _d = 0.0
 
+    # d^2 - 1, the constant term in the quadratic for r
+    _d2m1 = -1.0
+
     def __init__(self, x, y):
-        self._x = x
-        self._y = y
-        self._alpha = np.arctan2(y, x)
-        self._d = sqrt(x ** 2 + y ** 2)
+        self.move(x, y)
+
+    def _r_from_projection(self, k):
+        """
+        Returns the distance from the origin to the edge of the ring, given k = d cos(phi - alpha)
+
+        """
+        # Our distance is the positive solution to the quadratic equation r^2 - 2kr + (d^2 - 1) = 0
+        # This just comes out of some geometry if you draw the triangles
+        return _solve_r(k, self._d2m1)
 
     def _r(self, phi):
         """
         Returns the distance from the origin to the edge of the ring, looking along a line at an angle phi
         from the horizontal.
 
-        phi in rad
+        phi in rad; may be a scalar or an array of angles
 
         """
-        # Our distance is the positive solution to the quadratic equation r^2 + br + c = 0
-        # This just comes out of some geometry if you draw the triangles
-        b = -2 * self._d * np.cos(phi - self._alpha)
-        c = (self._d * self._d) - 1
-
-        return (-b + sqrt(b * b - 4 * c)) / 2
+        return self._r_from_projection(self._d * np.cos(phi - self._alpha))
 
     def misalignment(self, n):
         """
@@ -47,11 +96,13 @@ class Ring:
 
         Returns also an array of n array equally spaced between 0 and 2pi
 
+        The angles are shared between all rings, so are read-only; copy them if you need to modify them
+
         """
-        angles = np.linspace(0, 2 * np.pi)
+        angles, cos_a, sin_a = _angle_grid(n)
 
-        # Could make this faster, don't need to
-        return np.array([self._r(angle) for angle in angles]), angles
+        # d cos(phi - alpha) = x cos(phi) + y sin(phi), since (x, y) = d (cos(alpha), sin(alpha))
+        return self._r_from_projection(self._x * cos_a + self._y * sin_a), angles
 
     def centre(self):
         return self._x, self._y
@@ -63,51 +114,53 @@ class Ring:
         Not guaranteed to start at any particular angle - i.e. 
         
         """
-        angles = np.linspace(0, 2 * np.pi)
-        return (
-            np.array([self._x + np.cos(x) for x in angles]),
-            np.array([self._y + np.sin(x) for x in angles]),
-        )
+        _, cos_a, sin_a = _angle_grid(n)
+        return self._x + cos_a, self._y + sin_a
 
     def move(self, x, y):
         """
         Move this ring to be centred on (x, y)
 
         """
-        self.__init__(x, y)
+        self._x = x
+        self._y = y
+        self._alpha = atan2(y, x)
+        self._d = hypot(x, y)
+        self._d2m1 = self._d * self._d - 1.0
 
 
 class Noisy_Ring(Ring):
 
-    # Cache positional errors
-    _noise = None
+    # Cache the most recent positional errors, and the (n, noise level) they were found for
+    _error_key = None
     _x_error = None
     _y_error = None
 
-    def _set_error(self, n, level=0.05):
-        self._noise = level
+    # Random number generator for the errors
+    _rng = None
 
-        noise_mag = np.random.normal(scale=self._noise, size=n)
-        noise_angle = 2 * np.pi * np.random.uniform(size=n)
+    def _set_error(self, n, level=0.05):
+        noise_mag = level * self._rng.standard_normal(n)
+        noise_angle = self._rng.uniform(0, 2 * np.pi, n)
 
+        self._error_key = n, level
         self._x_error = noise_mag * np.cos(noise_angle)
         self._y_error = noise_mag * np.sin(noise_angle)
 
-    def _should_find_errors(self, force, n, noise_level):
+    def _error(self, n, noise_level, force=False):
         """
-        Find whether we need to recalculate the errs
+        Returns the (x, y) positional errors for n points at this noise level, only finding new ones if we need to
 
         """
         # If we haven't yet calculated them, we have changed n or the noise level or if we explicitly asked to
-        return bool(
-            force
-            or (self._x_error is None)
-            or len(self._x_error) != n
-            or self._noise != noise_level
-        )
+        if force or self._error_key != (n, noise_level):
+            self._set_error(n, noise_level)
 
-    def __init__(self, x, y):
+        return self._x_error, self._y_error
+
+    def __init__(self, x, y, seed=None):
         super().__init__(x, y)
+        self._rng = np.random.default_rng(seed)
 
     def boundary(self, n, noise=0.05, new_errors=False):
         """
@@ -116,12 +169,10 @@ class Noisy_Ring(Ring):
         Not guaranteed to start at any particular angle - i.e.
 
         """
-        if self._should_find_errors(new_errors, n, noise):
-            self._set_error(n, noise)
-
-        exact_x, exact_y = super().boundary(n)
+        x_error, y_error = self._error(n, noise, new_errors)
+        _, cos_a, sin_a = _angle_grid(n)
 
-        return exact_x + self._x_error, exact_y + self._y_error
+        return self._x + cos_a + x_error, self._y + sin_a + y_error
 
     def misalignment(self, n, noise=0.05):
         """
@@ -130,14 +181,112 @@ class Noisy_Ring(Ring):
         Returns also the angles
 
         """
-        if self._should_find_errors(False, n, noise):
-            self._set_error(n, noise)
-
-        x, y = self.boundary(n, noise)
+        x, y = self.boundary(n, noise, new_errors=False)
 
-        distances = np.sqrt(x ** 2 + y ** 2)
+        distances = np.hypot(x, y)
 
         angles = np.arctan2(y, x)
         angles[angles < 0] += 2 * np.pi
 
         return distances, angles
+
+
+class RingSet:
+    """
+    Class representing many Cherenkov rings at once
+
+    Unit radius, centred at the points (xs[i], ys[i]) provided to the ctor.
+    Stored as parallel arrays rather than one Ring per ring, so everything is evaluated for all rings in one go
+
+    """
+
+    def __init__(self, xs, ys):
+        self.move(xs, ys)
+
+    def move(self, xs, ys):
+        """
+        Move these rings to be centred on (xs, ys)
+
+        """
+        # Copy, so that the caller changing their arrays can't leave our cached values stale
+        self._xs = np.array(xs, dtype=float, ndmin=1)
+        self._ys = np.array(ys, dtype=float, ndmin=1)
+
+        # Distance of each centre from the origin
+        self._ds = np.hypot(self._xs, self._ys)
+
+        # d^2 - 1 for each ring, the constant term in the quadratic for r
+        self._d2m1s = self._ds * self._ds - 1.0
+
+    def __len__(self):
+        return len(self._xs)
+
+    def _r(self, phi):
+        """
+        Returns an (n_rings, n_angles) array of distances from the origin to the edge of each ring, looking along
+        lines at angles phi from the horizontal.
+
+        phi in rad; may be a scalar or an array of angles
+
+        """
+        phi = np.atleast_1d(np.asarray(phi, dtype=float))
+        return _r_from_trig(self._xs, self._ys, self._d2m1s, np.cos(phi), np.sin(phi))
+
+    def misalignment(self, n):
+        """
+        Returns an (n_rings, n) array of distances from the origin to the edge of each ring, equally spaced in angle
+        between 0 and 2 pi
+
+        Returns also an array of n angles equally spaced between 0 and 2pi
+
+        """
+        angles, cos_a, sin_a = _angle_grid(n)
+        return _r_from_trig(self._xs, self._ys, self._d2m1s, cos_a, sin_a), angles
+
+    def centres(self):
+        # Copies, so the cached values can't go stale
+        return self._xs.copy(), self._ys.copy()
+
+    def boundary(self, n):
+        """
+        Returns two (n_rings, n) arrays (x, y) of x and y co-ordinates of the ring edges
+
+        """
+        _, cos_a, sin_a = _angle_grid(n)
+        return self._xs[:, None] + cos_a, self._ys[:, None] + sin_a
+
+    def ring(self, i):
+        """
+        Returns the ith ring as a Ring
+
+        """
+        return Ring(self._xs[i], self._ys[i])
+
+
+def _r_from_trig(xs, ys, d2m1, cos_phi, sin_phi):
+    """
+    Returns an (n_rings, n_angles) array of distances from the origin to the edge of each ring,
+    given 1d arrays of the ring centres, d^2 - 1 for each ring and the cos and sin of each angle
+
+    """
+    # d cos(phi - alpha) for every (ring, angle) pair, broadcast in one go
+    k = xs[:, None] * cos_phi[None, :] + ys[:, None] * sin_phi[None, :]
+
+    return _solve_r(k, d2m1[:, None])
+
+
+def batch_r(xs, ys, phi):
+    """
+    Returns an (n_rings, n_angles) array of distances from the origin to the edge of each ring,
+    looking along lines at angles phi from the horizontal
+
+    xs, ys are the co-ordinates of the ring centres and phi in rad; each may be a scalar or an array
+
+    """
+    xs = np.atleast_1d(np.asarray(xs, dtype=float))
+    ys = np.atleast_1d(np.asarray(ys, dtype=float))
+    phi = np.atleast_1d(np.asarray(phi, dtype=float))
+
+    d2m1 = xs * xs + ys * ys - 1.0
+
+    return _r_from_trig(xs, ys, d2m1, np.cos(phi), np.sin(phi))
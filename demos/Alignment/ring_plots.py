@@ -6,6 +6,7 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 from matplotlib.patches import Arc
 import numpy as np
+from math import atan2, cos, sin
 
 
 def _empty_figure(figsize):
@@ -119,12 +120,17 @@ def _draw_diagram(
     ring.set_data(circle_x, circle_y)
 
     # Update the geometric bits (horizontal line, line at an angle phi, etc.)
+    # The point on the ring that the angled line goes to
+    idx = n // 5
+    cx, cy = circle_x[idx], circle_y[idx]
+
     horizontal_line.set_xdata((0, r0))
-    angled_line.set_data((0, circle_x[n // 5]), (0, circle_y[n // 5]))
-    r_label.set_position((-0.2 + circle_x[n // 5] / 2, circle_y[n // 5] / 2))
+    angled_line.set_data((0, cx), (0, cy))
+    r_label.set_position((-0.2 + cx / 2, cy / 2))
 
-    phi = np.arctan2(circle_y[n // 5] / 5, circle_x[n // 5] / 5)
-    phi_label.set_position((0.2 * np.cos(phi / 2.0), 0.2 * np.sin(phi / 2.0)))
+    # These are scalars, so use math rather than paying for numpy's ufunc dispatch
+    phi = atan2(cy, cx)
+    phi_label.set_position((0.2 * cos(phi / 2.0), 0.2 * sin(phi / 2.0)))
 
 
 def _draw_plot(r, phi, ring_centre_coords, n, line, title):
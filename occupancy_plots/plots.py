@@ -4,74 +4,112 @@ from matplotlib.colors import LogNorm
 from matplotlib.ticker import AutoMinorLocator, MultipleLocator
 import re
 
+# Mirror numbers between major ticks, and minor subdivisions between those
+# Locators get attached to (and mutated by) a single axis, so only the arguments can be shared
+_MAJOR_TICK_SPACING = 5
+_N_MINOR_TICKS = 5
+
 
 def parse(strings):
     """
-    Parse ints and floats for mirror number + occupancy from a match group string
+    Parse ints and floats for mirror number + occupancy from a match group tuple
 
     """
-    # Separated by a double spac
-    s = strings.split("  ")
-    return int(s[0][:-1]), int(s[1][:-1]), float(s[2])
+    # The regex has already split out (primary, secondary, occupancy)
+    return int(strings[0]), int(strings[1]), float(strings[2])
 
 
-def group(n, line, regex):
+def match_groups(line, regex):
     """
-    Get the nth match group found from line in regex, and convert from strings to (primary number, secondary number, occupancy)
+    Find all the (things in parentheses) in line using regex
+
+    Returns a list of (primary, secondary, occupancy) string tuples; either one or six of them
 
     """
-    # Separated by double spaces
-    match = regex.match(line)
-    if not match:
+    # The things we're interested in start after 22 arbitrary characters
+    groups = regex.findall(line, 22)
+
+    # Two cases: either we've matched a long line with six things in parentheses
+    # Or a short line with only one
+    if len(groups) not in (1, 6):
         raise re.error(f"No match found in line:\n\tcontents:{line}")
 
-    # Two cases: either we've matched a long line with many match groups
-    # Or a short line with only one match, the rest are None
-    groups = match.groups()
+    return groups
 
-    if not groups[1]:
-        # Short line matched
-        if n:
-            raise re.error(
-                f"No group {n} available on line:\n\tgroups:{groups}\nThis may be ok if you asked for a subset of mirror combinations (e.g. the MST)"
-            )
-        return parse(groups[n])
 
-    # If we get here, long line match. So ignore the second match group as thats just the entire line
-    groups = [groups[i] for i in range(len(groups)) if i != 1]
+def group(n, groups):
+    """
+    Get the nth (thing in parentheses) from the groups found by match_groups, and convert from strings to (primary number, secondary number, occupancy)
+
+    """
+    if len(groups) == 1 and n:
+        # Short line matched
+        raise re.error(
+            f"No group {n} available on line:\n\tgroups:{groups}\nThis may be ok if you asked for a subset of mirror combinations (e.g. the MST)"
+        )
 
     return parse(groups[n])
 
 
-def entire_bigraph(line, regex):
+def entire_bigraph(groups):
     """
     Returns (primary mirror number, secondary mirror number, occupancy)
 
     """
     # The information for the entire bigraph is in the 0th match group (i.e. it's the first relevant column in the text file)
-    return group(0, line, regex)
+    return group(0, groups)
 
 
-def minimum_spanning_solution(line, regex):
+def minimum_spanning_solution(groups):
     """
     Returns (primary mirror number, secondary mirror number, occupancy)
 
     """
     # MST is in the 2nd match group (0 indexed)
-    return group(2, line, regex)
+    return group(2, groups)
 
 
-def old_spanning_tree(line, regex):
+def old_spanning_tree(groups):
     """
     Returns (primary mirror number, secondary mirror number, occupancy)
 
     """
     # old spanning tree is in the 4th match group (0 indexed)
-    return group(4, line, regex)
+    return group(4, groups)
 
 
-def plot(array, title, path):
-    plt.clf()
+def occupancy_array(triples, shape):
+    """
+    Build a 2d array of occupancies indexed by [primary, secondary] from an iterable of (primary, secondary, occupancy)
+
+    Mirror pairs that don't appear in triples have an occupancy of 0
+
+    """
+    occupancies = np.zeros(shape)
+
+    # So that generators work too
+    triples = list(triples)
+    if not triples:
+        return occupancies
+
+    # One fancy-indexed assignment instead of a Python loop over every mirror pair
+    primary, secondary, occupancy = np.array(triples).T
+    occupancies[primary.astype(int), secondary.astype(int)] = occupancy
+
+    return occupancies
+
+
+# (array shape, figure, image, title) from the last call to plot, so later calls can reuse them
+_plot_cache = None
+
+
+def _create_figure(array):
+    """
+    Create a figure with an occupancy matshow, colorbar and gridlines
+
+    Returns (figure, image, title)
+
+    """
     f, ax = plt.subplots(1, 1)
     axcolor = f.add_axes()
     im = ax.matshow(array, norm=LogNorm(vmin=10, vmax=1000000))
@@ -80,22 +118,49 @@ def plot(array, title, path):
     colorbar.ax.set_ylabel("# Photon Hits")
 
     # Grid and stuff
-    ax.xaxis.set_major_locator(MultipleLocator(5))
-    ax.yaxis.set_major_locator(MultipleLocator(5))
+    ax.xaxis.set_major_locator(MultipleLocator(_MAJOR_TICK_SPACING))
+    ax.yaxis.set_major_locator(MultipleLocator(_MAJOR_TICK_SPACING))
 
-    ax.xaxis.set_minor_locator(AutoMinorLocator(5))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(5))
+    ax.xaxis.set_minor_locator(AutoMinorLocator(_N_MINOR_TICKS))
+    ax.yaxis.set_minor_locator(AutoMinorLocator(_N_MINOR_TICKS))
 
-    plt.grid(linewidth=0.3, color="k", which="major", alpha=1)
-    plt.grid(linewidth=0.2, color="k", which="minor", alpha=0.5)
+    ax.grid(linewidth=0.3, color="k", which="major", alpha=1)
+    ax.grid(linewidth=0.2, color="k", which="minor", alpha=0.5)
 
     ax.set_xlabel("Secondary mirror number")
     ax.set_ylabel("Primary mirror number")
 
-    f.suptitle(title)
+    return f, im, f.suptitle("")
+
+
+def plot(array, title, path):
+    global _plot_cache
+
+    # Only build the figure the first time; after that just swap the data and title
+    # The colour scale is fixed, so the colorbar doesn't need updating
+    if _plot_cache is None or _plot_cache[0] != array.shape:
+        if _plot_cache is not None:
+            plt.close(_plot_cache[1])
+        _plot_cache = (array.shape, *_create_figure(array))
+
+    _, f, im, suptitle = _plot_cache
+    im.set_data(array)
+    suptitle.set_text(title)
+
     print(f"Creating {title}")
-    plt.savefig(path)
-    plt.clf()
+    f.savefig(path)
+
+
+def plot_all(plots):
+    """
+    Make each plot from an iterable of (array, title, path)
+
+    The arrays are always n_primary x n_secondary mirrors, so each plot is quick; starting a process
+    (and re-importing numpy and matplotlib) for each one would cost more than it saves
+
+    """
+    for array, title, path in plots:
+        plot(array, title, path)
 
 
 def main():
@@ -106,18 +171,19 @@ def main():
     # Regex for parsing things
     # 22 arbitrary characters at the start of the line, then the relevant things are enclosed in (parentheses)
     # Each thing in parentheses  is formatted as XXp XXs XXXXX.0 for primary mirror, secondary mirror and occupancy
-    # Or... matches one (thing in parentheses, and nothing else)
-    # I wouldn't try to make sense of this if i were you, just check it works sensibly and move on with your life
-    pattern = r"^.{22}\((\d\dp\s+\d\ds\s+\d+\.0)\)(\s+\((\d\dp\s+\d\ds\s+\d+\.0)\)\s+\((\d\dp\s+\d\ds\s+\d+\.0)\)\s+\((\d\dp\s+\d\ds\s+\d+\.0)\)\s+\((\d\dp\s+\d\ds\s+\d+\.0)\)\s+\((\d\dp\s+\d\ds\s+\d+\.0)\)|)$"
+    # A line has either six of these things or just one
+    # Matching each thing on its own (rather than the whole line in one go) means there is no alternation to backtrack over
+    pattern = r"\((\d\d)p\s+(\d\d)s\s+(\d+\.0)\)"
     regex = re.compile(pattern)
 
     # Number of primary and secondary mirrors
     n_primary_mirrors = 28
     n_secondary_mirrors = 20
 
-    all_occupancies = np.zeros((n_primary_mirrors, n_secondary_mirrors))
-    mst_occupancies = np.zeros((n_primary_mirrors, n_secondary_mirrors))
-    old_occupancies = np.zeros((n_primary_mirrors, n_secondary_mirrors))
+    # (primary, secondary, occupancy) triples for each column
+    all_triples = []
+    mst_triples = []
+    old_triples = []
 
     # Iterate over the data in the file, collecting the information we want and exiting early if we run out of stuff to read
     print("Iterating over lines")
@@ -127,26 +193,38 @@ def main():
 
     for line in contents[2:]:
         try:
-            p, s, c = entire_bigraph(line, regex)
-            all_occupancies[p, s] = c
+            # Only run the regex once per line, then pick out each column from its groups
+            groups = match_groups(line, regex)
+            all_triples.append(entire_bigraph(groups))
 
             if read_short:
-                p, s, c = old_spanning_tree(line, regex)
-                old_occupancies[p, s] = c
+                old_triple = old_spanning_tree(groups)
+                mst_triple = minimum_spanning_solution(groups)
 
-                p, s, c = minimum_spanning_solution(line, regex)
-                mst_occupancies[p, s] = c
+                old_triples.append(old_triple)
+                mst_triples.append(mst_triple)
 
         except re.error as e:
             read_short = False
 
     print("done")
 
-    plot(old_occupancies, "Old Spanning Tree", "old.png")
-    plot(mst_occupancies, "MST Occupancies (new)", "mst.png")
-    plot(all_occupancies, "All Combinations", "all.png")
+    shape = (n_primary_mirrors, n_secondary_mirrors)
+    all_occupancies = occupancy_array(all_triples, shape)
+    mst_occupancies = occupancy_array(mst_triples, shape)
+    old_occupancies = occupancy_array(old_triples, shape)
+
+    plot_all(
+        (
+            (old_occupancies, "Old Spanning Tree", "old.png"),
+            (mst_occupancies, "MST Occupancies (new)", "mst.png"),
+            (all_occupancies, "All Combinations", "all.png"),
+        )
+    )
 
     # Also plot histograms of occupancies
+    # On a new figure, since plot() leaves its (reused) occupancy figure as the current one
+    plt.figure()
     kw = {"bins": np.logspace(-1, 6, 25), "alpha": 0.4}
     plt.hist(all_occupancies.flatten(), **kw, label="all", color="r")
     plt.hist(mst_occupancies.flatten(), **kw, label="mst", color="k")